@@ -2,7 +2,7 @@
 """
 
 Features:
- - Pooled PostgreSQL connections (psycopg2 SimpleConnectionPool)
+ - Pooled PostgreSQL connections (psycopg2 ThreadedConnectionPool)
  - Modular SonarrClient with unified error handling, heavily based on Huntarr project
  - Reads mismatch counts from an external incrementer script
  - Tags episode as matched or problematic
@@ -11,14 +11,21 @@ Features:
 import os
 import sys
 import re
+import string
 import time
 import logging
 import unicodedata
+import threading
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from requests.exceptions import ReadTimeout, RequestException
 import requests
-from psycopg2.pool import SimpleConnectionPool
-from rapidfuzz.fuzz import token_sort_ratio
-from word2number import w2n
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from psycopg2.pool import ThreadedConnectionPool
+from rapidfuzz import process
+from rapidfuzz.fuzz import ratio
 import psycopg2.extras
 from guessit import guessit
 import argparse
@@ -32,7 +39,11 @@ SONARR_URL         = os.getenv("SONARR_URL", "http://localhost:8989")
 SONARR_API_KEY     = os.getenv("SONARR_API_KEY") or sys.exit("❌ SONARR_API_KEY not set")
 API_TIMEOUT        = int(os.getenv("API_TIMEOUT", "10"))
 TVDB_FILTER        = os.getenv("TVDB_ID")
-LOG_LEVEL          = os.getenv("LOG_LEVEL")
+LOG_LEVEL          = os.getenv("LOG_LEVEL", "INFO")
+SCAN_WORKERS       = int(os.getenv("SCAN_WORKERS", "16"))
+DB_POOL_SIZE       = int(os.getenv("DB_POOL_SIZE", "4"))
+RESCAN_UNCHANGED   = os.getenv("RESCAN_UNCHANGED", "false").lower() == "true"
+FAST_SCENE_TITLE   = os.getenv("FAST_SCENE_TITLE", "false").lower() == "true"
 _raw = os.getenv("SEASON_FILTER", "")
 if _raw:
     try:
@@ -52,10 +63,12 @@ os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "analyzer.log")
 
 # Read LOG_LEVEL from env (default to "INFO" if not set)
-level_name = os.getenv("LOG_LEVEL", "INFO").upper()
+level_name = LOG_LEVEL.upper()
 
 # Convert the string name to an actual logging level (int), defaulting to INFO if unrecognized
 numeric_level = getattr(logging, level_name, logging.INFO)
+if not isinstance(numeric_level, int):
+    numeric_level = logging.INFO
 
 logging.basicConfig(
     level=numeric_level,
@@ -70,16 +83,39 @@ logging.basicConfig(
 # Database Connection Pool
 # -----------------------------------------------------------------------------
 
-db_pool = SimpleConnectionPool(minconn=1, maxconn=10, dsn=DATABASE_URL)
+# A scan is a one-shot process that does its database work on the main
+# thread, so one connection is opened up front and DB_POOL_SIZE only caps
+# the rare overlap. Created on first use: api.py and cleanup.py import this
+# module only for SonarrClient / grab_best_nzb and never touch the database
+# through it.
+db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool() -> ThreadedConnectionPool:
+    """Return the shared connection pool, opening it on first call."""
+    global db_pool
+    with _db_pool_lock:
+        if db_pool is None:
+            db_pool = ThreadedConnectionPool(
+                minconn=1,
+                maxconn=DB_POOL_SIZE,
+                dsn=DATABASE_URL,
+                keepalives=1,
+                keepalives_idle=60,
+                keepalives_interval=10,
+                keepalives_count=5
+            )
+    return db_pool
 
 def with_conn(fn):
     """Decorator: borrow a conn from the pool, return it when done."""
     def wrapper(*args, **kwargs):
-        conn = db_pool.getconn()
+        pool = get_db_pool()
+        conn = pool.getconn()
         try:
             return fn(conn, *args, **kwargs)
         finally:
-            db_pool.putconn(conn)
+            pool.putconn(conn)
     return wrapper
 
 # -----------------------------------------------------------------------------
@@ -129,6 +165,21 @@ def init_db(conn):
           PRIMARY KEY (episode_key, tag_id)
         );
     """)
+    # the PK covers lookups by episode_key; tag-side lookups (reporting,
+    # the ON DELETE CASCADE from tags) need their own index
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS episode_tags_tag_id_idx
+          ON episode_tags (tag_id);
+    """)
+
+    # 4) the scan only ever writes these tags, so resolve their ids once
+    cur.execute("""
+        INSERT INTO tags (name)
+        SELECT unnest(%s::text[])
+        ON CONFLICT (name) DO NOTHING
+    """, (list(SCAN_TAGS),))
+    cur.execute("SELECT name, id FROM tags WHERE name = ANY(%s)", (list(SCAN_TAGS),))
+    TAG_IDS.update(cur.fetchall())
 
     conn.commit()
     cur.close()
@@ -137,11 +188,20 @@ def init_db(conn):
 # Tag Helpers
 # -----------------------------------------------------------------------------
 
+SCAN_TAGS = ("matched", "problematic-episode")
+
+# tag name -> id, primed by init_db and filled lazily by ensure_tag
+TAG_IDS = {}
+
 def ensure_tag(conn, tag_name: str) -> int:
     """
     Make sure a tag with name=tag_name exists in `tags`.
-    Return its id (creating the row if needed).
+    Return its id (creating the row if needed), cached in TAG_IDS.
     """
+    tag_id = TAG_IDS.get(tag_name)
+    if tag_id is not None:
+        return tag_id
+
     with conn.cursor() as cur:
         cur.execute("""
             INSERT INTO tags (name)
@@ -150,148 +210,216 @@ def ensure_tag(conn, tag_name: str) -> int:
             RETURNING id
         """, (tag_name,))
         row = cur.fetchone()
-        if row:
-            return row[0]
+        if not row:
+            # If it already existed, fetch its id
+            cur.execute("SELECT id FROM tags WHERE name = %s", (tag_name,))
+            row = cur.fetchone()
 
-        # If it already existed, fetch its id
-        cur.execute("SELECT id FROM tags WHERE name = %s", (tag_name,))
-        return cur.fetchone()[0]
+    TAG_IDS[tag_name] = row[0]
+    return row[0]
 
-@with_conn
-def add_tag(conn, episode_key: str, tag_name: str) -> bool:
-    """
-    Attach tag_name to episode_key.
-    Returns True if a new episode_tags row was created.
-    """
-    tag_id = ensure_tag(conn, tag_name)
+# -----------------------------------------------------------------------------
+# Scan Batching
+# -----------------------------------------------------------------------------
 
+@with_conn
+def load_tag_links(conn) -> set:
+    """Return every (episode_key, tag_id) link for the SCAN_TAGS."""
+    tag_ids = [ensure_tag(conn, name) for name in SCAN_TAGS]
     with conn.cursor() as cur:
         cur.execute("""
-            INSERT INTO episode_tags (episode_key, tag_id)
-            VALUES (%s, %s)
-            ON CONFLICT (episode_key, tag_id) DO NOTHING
-        """, (episode_key, tag_id))
-        inserted = cur.rowcount > 0
-
+            SELECT episode_key, tag_id
+              FROM episode_tags
+             WHERE tag_id = ANY(%s)
+        """, (tag_ids,))
+        links = set(cur.fetchall())
     conn.commit()
-    return inserted
+    return links
 
 @with_conn
-def remove_tag(conn, episode_key: str, tag_name: str) -> bool:
-    """
-    Remove the given tag from an episode.
-    Returns True if a row was deleted, False otherwise.
-    """
+def load_scanned_titles(conn) -> dict:
+    """Return {key: (expected_title, actual_title)} from the last scan."""
     with conn.cursor() as cur:
-        # Attempt to delete via a sub‐select on tags.name
-        cur.execute("""
-            DELETE FROM episode_tags
-             WHERE episode_key = %s
-               AND tag_id = (
-                   SELECT id FROM tags WHERE name = %s
-               )
-        """, (episode_key, tag_name))
-        deleted = cur.rowcount > 0
-
+        cur.execute("SELECT key, expected_title, actual_title FROM episodes")
+        scanned = {key: (expected, actual) for key, expected, actual in cur}
     conn.commit()
-    return deleted
+    return scanned
 
 @with_conn
-def insert_episode(
-    conn,
-    key: str,
-    series_title: str,
-    code: str,
-    expected_title: str,
-    actual_title: str,
-    confidence: float,
-    norm_scene: str,
-    norm_expected: str,
-    norm_extracted: str,
-    substring_override: bool,
-    missing_title: bool,
-    series_id: int,
-    episode_id: int,
-    release_group: str,
-    media_info: dict
-):
+def load_override_keys(conn) -> set:
+    """Return every episode_key carrying the manual 'override' tag."""
     with conn.cursor() as cur:
         cur.execute("""
-            INSERT INTO episodes (
-                key,
-                series_title,
-                code,
-                expected_title,
-                actual_title,
-                confidence,
-                norm_scene,
-                norm_expected,
-                norm_extracted,
-                substring_override,
-                missing_title,
-                series_id,
-                episode_id,
-                release_group,
-                media_info
-            ) VALUES (
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s
-            )
-            ON CONFLICT (key) DO UPDATE SET
-                actual_title       = EXCLUDED.actual_title,
-                confidence         = EXCLUDED.confidence,
-                norm_scene         = EXCLUDED.norm_scene,
-                norm_expected      = EXCLUDED.norm_expected,
-                norm_extracted     = EXCLUDED.norm_extracted,
-                substring_override = EXCLUDED.substring_override,
-                missing_title      = EXCLUDED.missing_title,
-                series_id          = EXCLUDED.series_id,
-                episode_id         = EXCLUDED.episode_id,
-                release_group      = EXCLUDED.release_group,
-                media_info         = EXCLUDED.media_info;
-        """, (
-            key,
-            series_title,
-            code,
-            expected_title,
-            actual_title,
-            confidence,
-            norm_scene,
-            norm_expected,
-            norm_extracted,
-            substring_override,
-            missing_title,
-            series_id,
-            episode_id,
-            release_group,
-            psycopg2.extras.Json(media_info)
-        ))
+            SELECT et.episode_key
+              FROM episode_tags et
+              JOIN tags t ON et.tag_id = t.id
+             WHERE t.name = 'override'
+        """)
+        keys = {key for (key,) in cur}
     conn.commit()
+    return keys
+
+@with_conn
+def write_episode_batch(conn, rows: list, links: list, unlinks: list):
+    """
+    Upsert episode rows, then add and drop tag links, in one transaction.
+    rows are tuples in `episodes` column order; links/unlinks are
+    (episode_key, tag_id) pairs.
+    """
+    # ON CONFLICT DO UPDATE can't touch the same key twice in one statement
+    rows = list({row[0]: row for row in rows}.values())
 
-@with_conn 
-def has_override_tag(conn, key: str) -> bool:
     with conn.cursor() as cur:
-        cur.execute("""
-            SELECT 1
-            FROM episode_tags et
-            JOIN tags t ON et.tag_id = t.id
-            WHERE et.episode_key = %s AND t.name = 'override'
-        """, (key,))
-        return cur.fetchone() is not None  
+        # scan results are rebuilt by the next scan, so don't wait on fsync
+        cur.execute("SET LOCAL synchronous_commit TO OFF")
+        if rows:
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO episodes (
+                    key,
+                    series_title,
+                    code,
+                    expected_title,
+                    actual_title,
+                    confidence,
+                    norm_scene,
+                    norm_expected,
+                    norm_extracted,
+                    substring_override,
+                    missing_title,
+                    series_id,
+                    episode_id,
+                    release_group,
+                    media_info
+                ) VALUES %s
+                ON CONFLICT (key) DO UPDATE SET
+                    expected_title     = EXCLUDED.expected_title,
+                    actual_title       = EXCLUDED.actual_title,
+                    confidence         = EXCLUDED.confidence,
+                    norm_scene         = EXCLUDED.norm_scene,
+                    norm_expected      = EXCLUDED.norm_expected,
+                    norm_extracted     = EXCLUDED.norm_extracted,
+                    substring_override = EXCLUDED.substring_override,
+                    missing_title      = EXCLUDED.missing_title,
+                    series_id          = EXCLUDED.series_id,
+                    episode_id         = EXCLUDED.episode_id,
+                    release_group      = EXCLUDED.release_group,
+                    media_info         = EXCLUDED.media_info
+                -- identical rows are left alone: no new tuple, no WAL
+                WHERE (
+                    episodes.expected_title, episodes.actual_title,
+                    episodes.confidence, episodes.norm_scene,
+                    episodes.norm_expected, episodes.norm_extracted,
+                    episodes.substring_override, episodes.missing_title,
+                    episodes.series_id, episodes.episode_id,
+                    episodes.release_group, episodes.media_info
+                ) IS DISTINCT FROM (
+                    EXCLUDED.expected_title, EXCLUDED.actual_title,
+                    EXCLUDED.confidence, EXCLUDED.norm_scene,
+                    EXCLUDED.norm_expected, EXCLUDED.norm_extracted,
+                    EXCLUDED.substring_override, EXCLUDED.missing_title,
+                    EXCLUDED.series_id, EXCLUDED.episode_id,
+                    EXCLUDED.release_group, EXCLUDED.media_info
+                )
+            """, rows, page_size=500)
+
+        if unlinks:
+            cur.execute("""
+                DELETE FROM episode_tags
+                 WHERE (episode_key, tag_id) IN (
+                       SELECT * FROM unnest(%s::text[], %s::integer[])
+                 )
+            """, ([k for k, _ in unlinks], [t for _, t in unlinks]))
+
+        if links:
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO episode_tags (episode_key, tag_id)
+                VALUES %s
+                ON CONFLICT (episode_key, tag_id) DO NOTHING
+            """, links, page_size=500)
+
+    conn.commit()
+
+class ScanWriter:
+    """
+    Collects episode rows and matched/problematic tag changes during a scan
+    and writes them with write_episode_batch. Current tag links are loaded
+    once so only real changes are sent, and episodes whose titles haven't
+    changed since the last scan can be skipped outright. Manually
+    overridden keys are loaded up front too.
+    """
+    def __init__(self):
+        self.rows      = []
+        self.links     = load_tag_links()
+        self.overrides = load_override_keys()
+        self.scanned   = {} if RESCAN_UNCHANGED else load_scanned_titles()
+        self.to_link   = []
+        self.to_unlink = []
+
+    def unchanged(self, key: str, expected_title: str, actual_title: str) -> bool:
+        """
+        True if key was scored last scan against the same expected and
+        scene titles and still carries one of the SCAN_TAGS.
+        """
+        if self.scanned.get(key) != (expected_title, actual_title):
+            return False
+        return any((key, TAG_IDS[name]) in self.links for name in SCAN_TAGS)
+
+    def record(self, row: tuple, add_name: str, remove_name: str) -> bool:
+        """
+        Queue an episode row and its tag flip.
+        Returns True if add_name was not already attached.
+        """
+        key = row[0]
+        add_id, remove_id = TAG_IDS[add_name], TAG_IDS[remove_name]
+        self.rows.append(row)
+
+        if (key, remove_id) in self.links:
+            self.links.discard((key, remove_id))
+            self.to_unlink.append((key, remove_id))
+
+        if (key, add_id) in self.links:
+            return False
+        self.links.add((key, add_id))
+        self.to_link.append((key, add_id))
+        return True
+
+    def flush(self):
+        """Write everything queued so far; the buffers are cleared even on error."""
+        rows, links, unlinks = self.rows, self.to_link, self.to_unlink
+        self.rows, self.to_link, self.to_unlink = [], [], []
+        if rows or links or unlinks:
+            write_episode_batch(rows, links, unlinks)
+
 # -----------------------------------------------------------------------------
 # Sonarr API Client
 # -----------------------------------------------------------------------------
 
 class SonarrClient:
-    def __init__(self, base_url, api_key, timeout=10):
+    def __init__(self, base_url, api_key, timeout=10, pool_maxsize=32):
         self.base_url = base_url.rstrip("/")
         self.timeout  = timeout
         self.session  = requests.Session()
+        # requests advertises br alongside gzip/deflate once brotli is installed
         self.session.headers.update({
             "X-Api-Key": api_key,
-            "User-Agent": "analyzer"
+            "User-Agent": "analyzer",
+            "Accept": "application/json",
         })
+        # keep enough sockets alive for concurrent scan requests to one host,
+        # and ride out Sonarr restarts / proxy 5xx on idempotent calls.
+        # read=False leaves read timeouts to the caller (delete_episode_file
+        # verifies those itself).
+        retries = Retry(
+            total=3,
+            read=False,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        # every call goes to one Sonarr host, so a single host pool is enough
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def request(self, endpoint, method="GET", json_data=None):
         url = f"{self.base_url}/api/v3/{endpoint.lstrip('/')}"
@@ -320,33 +448,74 @@ class SonarrClient:
 # Utility
 # -----------------------------------------------------------------------------
 
-# 1) A pattern matching all English number-words we care about
-_NUMWORD = (
-    r"zero|one|two|three|four|five|six|seven|eight|nine|ten|"
-    r"eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|"
-    r"eighteen|nineteen|"
-    r"twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|"
-    r"hundred|thousand|million"
-)
+# 1) All English number-words we care about, with their values
+_NUM_VALUES = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+    "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19,
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+    "hundred": 100, "thousand": 1000, "million": 1000000,
+}
+# longest first, so "seventeen" is tried before "seven" and never backtracks
+_NUMWORD = "|".join(sorted(_NUM_VALUES, key=len, reverse=True))
 # 2) Build a regex that grabs one or more of those, allowing hyphens or spaces
 NUM_RE = re.compile(
-    rf"(?i)\b(?:{_NUMWORD})(?:[ \-](?:{_NUMWORD}))*\b"
+    rf"\b(?:{_NUMWORD})(?:[ \-](?:{_NUMWORD}))*\b",
+    re.IGNORECASE,
 )
+# 3) NUM_RE can only match when some whole word is a number-word
+_WORD_SPLIT_RE = re.compile(r"\W+")
+
+def _phrase_to_int(phrase: str) -> int:
+    """
+    Fold a NUM_RE match ("twenty-one", "two hundred five") into an int:
+    hundred scales the running group, thousand/million close it out.
+    """
+    phrase = phrase.lower()
+    # most matches are a single word ("two", "eleven")
+    value = _NUM_VALUES.get(phrase)
+    if value is not None:
+        return value
+
+    total = current = 0
+    for word in phrase.replace("-", " ").split():
+        value = _NUM_VALUES[word]
+        if value == 100:
+            current = (current or 1) * value
+        elif value >= 1000:
+            total  += (current or 1) * value
+            current = 0
+        else:
+            current += value
+    return total + current
 
+@lru_cache(maxsize=8192)
 def collapse_numbers(text: str) -> str:
     """
     Replace each contiguous run of pure number-words with its digit equivalent,
     leaving all other words intact.
     """
-    def _repl(match):
-        phrase = match.group(0)
-        try:
-            return str(w2n.word_to_num(phrase))
-        except ValueError:
-            return phrase  # fallback, shouldn’t happen
+    if _NUM_VALUES.keys().isdisjoint(_WORD_SPLIT_RE.split(text.lower())):
+        return text
+    return NUM_RE.sub(lambda m: str(_phrase_to_int(m.group(0))), text)
+
+# Pt/Part <n> → <n>
+_PART_RE = re.compile(r'(?i)\b(?:pt|part)[\.#]?\s*(\d+)\b')
+
+# Lowercase ASCII letters and drop every other non-alphanumeric ASCII char
+_ASCII_NORMALIZE = str.maketrans(
+    string.ascii_uppercase,
+    string.ascii_lowercase,
+    "".join(chr(i) for i in range(128) if not chr(i).isalnum())
+)
 
-    return NUM_RE.sub(_repl, text)
+# SxxEyy or NxNN anywhere in a title
+_EPISODE_NUMBERS_RE = re.compile(r'[sS]\d{1,2}[eE]\d{1,2}|\d{1,2}x\d{1,2}')
 
+@lru_cache(maxsize=8192)
 def normalize_title(text: str) -> str:
     if not text:
         return ""
@@ -354,13 +523,16 @@ def normalize_title(text: str) -> str:
     # collapse spelled-out numbers
     text = collapse_numbers(text)
     # collapse Pt/Part → digits
-    text = re.sub(r'(?i)\b(?:pt|part)[\.#]?\s*(\d+)\b', r'\1', text)
+    text = _PART_RE.sub(r'\1', text)
     # strip non-alphanumerics
+    if text.isascii():
+        # NFKD is a no-op on ASCII; filter + lowercase in one C-level pass
+        return text.translate(_ASCII_NORMALIZE)
     text = unicodedata.normalize("NFKD", text)
     return "".join(c for c in text if c.isalnum()).lower()
 
 def has_episode_numbers(title: str) -> bool:
-    return bool(re.search(r'[sS]\d{1,2}[eE]\d{1,2}', title) or re.search(r'\d{1,2}x\d{1,2}', title))
+    return bool(_EPISODE_NUMBERS_RE.search(title))
 
 # Matches:
 #  • S01E02 or s1e2       (1–2 digits for both)
@@ -383,56 +555,182 @@ def has_season_episode(scene_name: str) -> bool:
     """
     return bool(_HAS_EPISODE_RE.search(scene_name))
  
-def is_missing_title(scene_name: str) -> bool:
-    """True if extract_scene_title returns no episode title."""
-    return not bool(extract_scene_title(scene_name))
-
-def compute_confidence(expected_title: str, scene_name: str) -> float:
-    # 1) Normalize expected
-    norm_expected = normalize_title(expected_title)
-
-    # 2) Extract just the title portion from the scene file name
-    raw_scene_title = extract_scene_title(scene_name)
-    norm_extracted_scene = normalize_title(raw_scene_title)
-    
-    # 3) However use the entire normalized scene name to do the comparison for perfect matches   
-    norm_scene = normalize_title(scene_name)
-
-    logging.debug(f"Raw scene: {raw_scene_title!r}")
-    logging.debug(f"Normalized expected: {norm_expected!r}")
-    logging.debug(f"Normalized extracted scene  : {norm_extracted_scene!r}")
-    logging.debug(f"Normalized scene  : {norm_scene!r}")
-    logging.debug(f"Substring match?  : {norm_expected in norm_scene}")
+def _confidence_without_fuzzy(
+    norm_expected: str,
+    scene_name: str,
+    norm_scene: str = None,
+    raw_scene_title: str = None,
+) -> tuple:
+    """
+    Every compute_confidence rule except the fuzzy title score.
+    Returns (confidence, None) when the scene is decided here, otherwise
+    (None, norm_extracted_scene) for the caller to score.
+    norm_scene / raw_scene_title may be passed in when the caller already
+    has them; otherwise they're computed only if a rule needs them.
+    """
+    # 2) Use the entire normalized scene name to do the comparison for perfect matches
+    if norm_scene is None:
+        norm_scene = normalize_title(scene_name)
+
+    # %-style args: per-episode debug strings are only built when DEBUG is on
+    logging.debug("Normalized expected: %r", norm_expected)
+    logging.debug("Normalized scene  : %r", norm_scene)
+    logging.debug("Substring match?  : %s", norm_expected in norm_scene)
     
     # ───── Substring override ─────
     # If the normalized expected title literally appears in the normalized scene title, 
-    # it’s a perfect match.
+    # it’s a perfect match. Checked first so correctly named files skip the
+    # title extraction and fuzzy scoring below.
     if norm_expected in norm_scene:
-        return 1.0
+        return 1.0, None
 
     # 3) No SxxEyy → no confidence
     if not has_season_episode(scene_name):
-        logging.debug(f"No SXXEXX format")
-        return 0.0
+        logging.debug("No SXXEXX format")
+        return 0.0, None
 
-    # 4) Season match but no title words → base for missing title
-    if is_missing_title(scene_name):
-        logging.debug(f"Missing title")
-        return 0.8
+    # 4) Extract just the title portion from the scene file name
+    if raw_scene_title is None:
+        raw_scene_title = extract_scene_title(scene_name)
 
-    # 5) Season match + title present → exponentially penalize mismatch
+    # 5) Season match but no title words → base for missing title
+    if not raw_scene_title:
+        logging.debug("Missing title")
+        return 0.8, None
+
+    norm_extracted_scene = normalize_title(raw_scene_title)
+
+    logging.debug("Raw scene: %r", raw_scene_title)
+    logging.debug("Normalized extracted scene  : %r", norm_extracted_scene)
+    return None, norm_extracted_scene
+
+def _title_confidence(title_score: float) -> float:
+    # 6) Season match + title present → exponentially penalize mismatch
     #    e.g. base_conf=0.8, exponent=3
-    title_score = token_sort_ratio(norm_expected, norm_extracted_scene) / 100.0
     base_conf   = 0.8
     exp         = 1
     conf = base_conf * (title_score ** exp)
-    logging.debug(f"Score  : {conf}")
+    logging.debug("Score  : %s", conf)
     return round(conf, 2)
 
+def compute_confidence(
+    expected_title: str,
+    scene_name: str,
+    norm_expected: str = None,
+    norm_scene: str = None,
+    raw_scene_title: str = None,
+) -> float:
+    """
+    Confidence that scene_name is expected_title. Callers that have already
+    normalized/extracted the parts (check_episode) pass them in so the
+    scene is only parsed once.
+    """
+    # 1) Normalize expected
+    if norm_expected is None:
+        norm_expected = normalize_title(expected_title)
+
+    conf, norm_extracted_scene = _confidence_without_fuzzy(
+        norm_expected, scene_name, norm_scene, raw_scene_title
+    )
+    if conf is not None:
+        return conf
+    return _title_confidence(ratio(norm_expected, norm_extracted_scene) / 100.0)
+
+def score_candidates(expected_title: str, scene_names: list) -> list:
+    """
+    compute_confidence for many scene names against one expected title.
+    Names that reach the fuzzy step are scored together in one
+    process.cdist row instead of one ratio() call each.
+    """
+    norm_expected = normalize_title(expected_title)
+
+    confidences, pending = [], []
+    for i, scene_name in enumerate(scene_names):
+        conf, norm_extracted_scene = _confidence_without_fuzzy(norm_expected, scene_name)
+        confidences.append(conf)
+        if conf is None:
+            pending.append((i, norm_extracted_scene))
+
+    if pending:
+        row = process.cdist([norm_expected], [n for _, n in pending], scorer=ratio)[0]
+        for (i, _), score in zip(pending, row.tolist()):
+            confidences[i] = _title_confidence(score / 100.0)
+
+    return confidences
+
+# Fast path for extract_scene_title: "<show>.S01E02.<title>.<quality>…" with
+# a plain-words title. Anything less regular falls back to guessit. Off
+# unless FAST_SCENE_TITLE=true until it has been checked against guessit on
+# a real corpus of scene names.
+_SCENE_SEP = r"[.\s_\-]"
+_FAST_TITLE_RE = re.compile(
+    rf"(?:^|{_SCENE_SEP})S\d{{1,2}}E\d{{1,3}}{_SCENE_SEP}+(.+?){_SCENE_SEP}+"
+    r"(?:\d{3,4}[pi]|web-?dl|webrip|bluray|bdrip|brrip|hdtv|hdrip|dvdrip|remux"
+    r"|x26[45]|h\.?26[45]|hevc|xvid|mkv|mp4|avi)"
+    rf"(?={_SCENE_SEP}|$)",
+    re.IGNORECASE,
+)
+_FAST_TITLE_SPLIT_RE = re.compile(r"[.\s_]+(?:-[.\s_]+)?")
+# words guessit may read as something other than episode title
+_GUESSIT_WORDS = frozenset({
+    "part", "pt", "episode", "ep", "season", "extended", "internal",
+    "repack", "proper", "real", "rerip", "dubbed", "subbed", "multi", "dual",
+    "uncut", "unrated", "limited", "complete", "remastered", "imax", "hdr",
+    "web", "amzn", "nf", "dsnp", "hulu", "atvp", "hmax", "max", "pcok",
+    # guessit episode_details
+    "pilot", "special", "specials", "final", "unaired", "extras", "bonus",
+    "omake", "ova",
+    # full streaming-service names
+    "netflix", "hbo", "disney", "amazon", "apple", "peacock", "paramount",
+    "showtime", "starz", "crunchyroll", "youtube", "itunes", "vudu",
+    "english", "french", "truefrench", "vostfr", "german", "italian",
+    "spanish", "nordic", "swedish", "danish", "dutch", "russian",
+    # short language codes guessit strips from the title
+    "en", "eng", "fr", "fre", "fra", "vf", "vff", "vfq", "vo", "vost",
+    "de", "ger", "deu", "it", "ita", "es", "esp", "spa", "lat", "por",
+    "nl", "nld", "sv", "swe", "no", "nor", "da", "dan", "fi", "fin",
+    "pl", "pol", "ru", "rus", "cz", "cze", "hu", "hun", "tr", "tur",
+    "gr", "gre", "jp", "jpn", "jap", "kor", "chi", "hin", "ara", "heb",
+    "sub", "subs", "dub", "multisub",
+    # other release tags
+    "hybrid", "remux", "uhd", "sdr", "dv", "dovi", "ws", "fs", "dc",
+    "directors", "criterion", "openmatte", "festival", "screener",
+    "sample", "readnfo", "nfofix", "dirfix", "syncfix", "hc", "hardcoded",
+    "ac", "aac", "dts", "ddp", "dd", "atmos", "flac", "opus",
+})
+
+def _fast_scene_title(scene_name: str) -> str:
+    """
+    Title between a single SxxEyy tag and the first quality/codec/extension
+    token, or "" if the name doesn't have that plain shape (multi-episode
+    tags, release groups, years, guessit keywords, punctuation…).
+    """
+    m = _FAST_TITLE_RE.search(scene_name)
+    if not m:
+        return ""
+    words = _FAST_TITLE_SPLIT_RE.split(m.group(1))
+    for w in words:
+        if not w.replace("'", "").isalpha():
+            return ""
+        lw = w.lower()
+        if lw in _GUESSIT_WORDS or lw.endswith(("sub", "subs")):
+            return ""
+        if len(w) > 1 and w.isupper():
+            return ""
+    return " ".join(words)
+
+@lru_cache(maxsize=8192)
 def extract_scene_title(scene_name: str) -> str:
     """
-    Use guessit to pull out the *episode* title (not the show title).
+    Pull out the *episode* title (not the show title) with guessit, or the
+    regex fast path for plain scene names when FAST_SCENE_TITLE is set.
+    Cached: check_episode and compute_confidence both ask for the same
+    scene.
     """
+    if FAST_SCENE_TITLE:
+        title = _fast_scene_title(scene_name)
+        if title:
+            return title
     info = guessit(scene_name, {"type": "episode"})
     # 'episode_title' holds things like "The Son Also Draws"
     return (info.get("episode_title") or "").strip()
@@ -462,6 +760,9 @@ def delete_episode_file(client: SonarrClient, file_id: int):
     except RequestException as e:
         logging.exception(f"❌ Failed to delete file ID {file_id}: {e}")
      
+# Sonarr command states after which no more results will arrive
+SONARR_COMMAND_DONE = {"completed", "failed", "aborted", "cancelled", "orphaned"}
+
 def grab_best_nzb(
     client: "SonarrClient",
     series_id: int,
@@ -495,7 +796,14 @@ def grab_best_nzb(
 
     cmd_id = cmd["id"]
     append(f"🔍 EpisodeSearch started (id={cmd_id}) for episode {episode_id}")
-    time.sleep(wait)
+
+    # Wait for the search to finish rather than a fixed sleep, capped at 3×wait
+    deadline = time.monotonic() + wait * 3
+    while time.monotonic() < deadline:
+        status = client.get(f"command/{cmd_id}") or {}
+        if (status.get("status") or status.get("state")) in SONARR_COMMAND_DONE:
+            break
+        time.sleep(0.5)
 
     # --- Step 2: get candidate releases
     releases = client.get(f"release?episodeId={episode_id}") or []
@@ -517,10 +825,9 @@ def grab_best_nzb(
         raise RuntimeError("Could not fetch expected episode title")
 
     # Compute confidence for each
+    titles = [r.get("title", "") for r in top_candidates]
     scored = []
-    for r in top_candidates:
-        title = r.get("title", "")
-        conf = compute_confidence(expected_title, title)
+    for r, title, conf in zip(top_candidates, titles, score_candidates(expected_title, titles)):
         r["_confidence"] = conf
         scored.append(r)
         append(f"🔹 '{title[:80]}' → confidence {conf:.2f}, score {r.get('customFormatScore',0)}")
@@ -539,9 +846,8 @@ def grab_best_nzb(
 
     append(f"🏆 Selected '{best_title}' (confidence={best_conf:.2f}, score={best_score})")
 
-    # --- Step 6: delete existing episode file
-    ep = client.get(f"episode/{episode_id}") or {}
-    file_id = ep.get("episodeFileId")
+    # --- Step 6: delete existing episode file (ep_details is from step 4)
+    file_id = ep_details.get("episodeFileId")
     if file_id:
         try:
             delete_episode_file(client, file_id)
@@ -577,11 +883,10 @@ def grab_best_nzb(
 # Core Logic
 # -----------------------------------------------------------------------------
 
-def check_episode(client: SonarrClient, series: dict, ep: dict):
+def check_episode(writer: ScanWriter, series: dict, series_norm: str, ep: dict, epfile: dict):
     if not ep.get("hasFile") or not ep.get("episodeFileId"):
         return
 
-    epfile = client.get(f"episodefile/{ep['episodeFileId']}")
     if epfile is None:
         logging.error(f"❌ Failed to fetch file metadata for {series['title']} ep {ep['id']}")
         return
@@ -591,12 +896,28 @@ def check_episode(client: SonarrClient, series: dict, ep: dict):
     parsed_season = ep["seasonNumber"]
     parsed_epnum  = ep["episodeNumber"]
 
-    key  = f"series::{normalize_title(series['title'])}::S{parsed_season:02d}E{parsed_epnum:02d}"
     code = f"S{parsed_season:02d}E{parsed_epnum:02d}"
+    key  = f"series::{series_norm}::{code}"
     nice = series["title"]
     
+    # NOT NULL columns: one None here would fail the whole series batch
+    expected_title = ep.get("title") or ""
+
+    # Same file, same expected title → last scan's score and tags still hold
+    if writer.unchanged(key, expected_title, scene):
+        logging.debug("⏭️ %s %s unchanged since last scan", nice, code)
+        return
+
+    logging.info("\n📺 %s %s", nice, code)
+    logging.info("🎯 Expected: %s", expected_title)
+    logging.info("🎞️ Scene:    %s", scene)
+
+    # Skip matching logic if episode has override tag (preloaded per scan)
+    if key in writer.overrides:
+        logging.info("🛑 Skipping %s — manually overridden", key)
+        return
+
     # 1) Normalize expected
-    expected_title = ep["title"]
     norm_expected = normalize_title(expected_title)
 
     # 2) Extract just the title portion from the scene file name
@@ -605,43 +926,70 @@ def check_episode(client: SonarrClient, series: dict, ep: dict):
 
     norm_scene = normalize_title(scene)
     substring_override = (norm_expected in norm_extracted)
-    missing_title      = is_missing_title(scene)
+    missing_title      = not raw_scene_title
     
-    release_group = epfile.get("releaseGroup", "")
-    media_info    = epfile.get("mediaInfo", {}) 
-    
-    logging.info(f"\n📺 {nice} {code}")
-    logging.info(f"🎯 Expected: {ep['title']}")
-    logging.info(f"🎞️ Scene:    {scene}")
-
-    # Skip matching logic if episode has override tag 
-    if has_override_tag(key):
-        logger.info(f"🛑 Skipping {key} — manually overridden")
-        return
+    release_group = epfile.get("releaseGroup") or ""
+    media_info    = epfile.get("mediaInfo") or {} 
      
-    confidence = compute_confidence(expected_title, scene)
-    
-    insert_episode(
-        key, nice, code, expected_title, scene, confidence, norm_scene, norm_expected, norm_extracted, substring_override, missing_title, series["id"], ep["id"], release_group, media_info
+    confidence = compute_confidence(
+        expected_title, scene,
+        norm_expected=norm_expected,
+        norm_scene=norm_scene,
+        raw_scene_title=raw_scene_title,
     )
 
-    # On match: check for and add matched tag
     if confidence >= 0.5:
-        if add_tag(key, "matched"):
-            remove_tag(key, "problematic-episode")
-            logging.info(f"✅ Tagged {nice} {code} as matched")
+        add_name, remove_name = "matched", "problematic-episode"
+    else:
+        add_name, remove_name = "problematic-episode", "matched"
+
+    # Queue the row and tag flip; ScanWriter writes them in bulk
+    added = writer.record(
+        (key, nice, code, expected_title, scene, confidence, norm_scene, norm_expected, norm_extracted, substring_override, missing_title, series["id"], ep["id"], release_group, psycopg2.extras.Json(media_info)),
+        add_name, remove_name
+    )
+
+    # On match
+    if confidence >= 0.5:
+        if added:
+            logging.info("✅ Tagged %s %s as matched", nice, code)
         else:
-            logging.info(f"✅ ‘matched’ tag already present for {nice} {code}")
+            logging.info("✅ ‘matched’ tag already present for %s %s", nice, code)
         return
 
     # On mismatch
-    if confidence < 0.5:
-        if add_tag(key, "problematic-episode"):
-            remove_tag(key, "matched")
-            logging.info(f"⏩ Tagging mismatched")
-        else:
-            logging.info(f"⏩ Already tagged {nice} {code}; skipping")
-        return
+    if added:
+        logging.info("⏩ Tagging mismatched")
+    else:
+        logging.info("⏩ Already tagged %s %s; skipping", nice, code)
+
+
+def fetch_episodes(client: SonarrClient, series_id: int, season: int = None) -> list:
+    """
+    Fetch a series' episodes, asking Sonarr for only the wanted seasons
+    when a season or SEASON_FILTER narrows the scan.
+    """
+    if season is not None:
+        seasons = [season] if not SEASON_FILTER or season in SEASON_FILTER else []
+    elif SEASON_FILTER:
+        seasons = sorted(SEASON_FILTER)
+    else:
+        return client.get(f"episode?seriesId={series_id}") or []
+
+    episodes = []
+    for n in seasons:
+        episodes.extend(client.get(f"episode?seriesId={series_id}&seasonNumber={n}") or [])
+    return episodes
+
+
+def fetch_series(client: SonarrClient, series_id: int, season: int = None) -> tuple:
+    """
+    Fetch a series' episodes and all of its episode files in two calls.
+    Returns (episodes, {episodeFileId: epfile}).
+    """
+    episodes = fetch_episodes(client, series_id, season)
+    epfiles  = client.get(f"episodefile?seriesId={series_id}") or []
+    return episodes, {f["id"]: f for f in epfiles}
 
 
 def scan_library(client: SonarrClient, series_id: int = None, season: int = None):
@@ -657,28 +1005,56 @@ def scan_library(client: SonarrClient, series_id: int = None, season: int = None
             logging.error(f"❌ No series found for ID {series_id}")
             return
         series_list = [series]
+    elif TVDB_FILTER:
+        series_list = client.get(f"series?tvdbId={TVDB_FILTER}") or []
     else:
         series_list = client.get("series") or []
 
-    for series in series_list:
-        if TVDB_FILTER and str(series.get("tvdbId")) != TVDB_FILTER:
-            continue
-
-        logging.info(f"\n=== Scanning {series['title']} ===")
-
-        episodes = client.get(f"episode?seriesId={series['id']}") or []
-
-        for ep in episodes:
-            # apply filters if needed
-            if season and ep["seasonNumber"] != season:
-                continue
-            if SEASON_FILTER and ep["seasonNumber"] not in SEASON_FILTER:
-                continue
+    writer = ScanWriter()
+    pending = (
+        series for series in series_list
+        if not TVDB_FILTER or str(series.get("tvdbId")) == TVDB_FILTER
+    )
 
-            try:
-                check_episode(client, series, ep)
-            except Exception:
-                logging.exception(f"Fatal error checking {series['title']} ep {ep.get('id')}")
+    # HTTP fans out across the pool; check_episode stays on this thread.
+    # Only a couple of fetches per worker are in flight at once, and each
+    # result is dropped once scanned, so memory doesn't grow with the library.
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+        futures = {}
+        for series in islice(pending, 2 * SCAN_WORKERS):
+            futures[pool.submit(fetch_series, client, series["id"], season)] = series
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                series = futures.pop(fut)
+                nxt = next(pending, None)
+                if nxt is not None:
+                    futures[pool.submit(fetch_series, client, nxt["id"], season)] = nxt
+
+                logging.info(f"\n=== Scanning {series['title']} ===")
+                series_norm = normalize_title(series["title"])
+
+                episodes, epfiles = fut.result()
+                for ep in episodes:
+                    # apply filters if needed
+                    if season and ep["seasonNumber"] != season:
+                        continue
+                    if SEASON_FILTER and ep["seasonNumber"] not in SEASON_FILTER:
+                        continue
+                    if not ep.get("hasFile") or not ep.get("episodeFileId"):
+                        continue
+                    epfile = epfiles.get(ep["episodeFileId"])
+                    try:
+                        check_episode(writer, series, series_norm, ep, epfile)
+                    except Exception:
+                        logging.exception(f"Fatal error checking {series['title']} ep {ep.get('id')}")
+
+                # one transaction per series keeps progress durable and memory flat
+                try:
+                    writer.flush()
+                except Exception:
+                    logging.exception(f"Fatal error saving results for {series['title']}")
 
 
 # -----------------------------------------------------------------------------
@@ -695,7 +1071,7 @@ if __name__ == "__main__":
     try:
         args = parse_args()
         init_db()
-        sonarr = SonarrClient(SONARR_URL, SONARR_API_KEY, timeout=API_TIMEOUT)
+        sonarr = SonarrClient(SONARR_URL, SONARR_API_KEY, timeout=API_TIMEOUT, pool_maxsize=SCAN_WORKERS)
         scan_library(sonarr, series_id=args.series_id, season=args.season)
     except Exception:
         logging.critical("💥 Unhandled exception, shutting down", exc_info=True)
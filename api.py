@@ -4,6 +4,7 @@
 import logging
 import threading
 import os
+import re
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from flask import Flask, request, jsonify, abort
@@ -28,6 +29,9 @@ sonarr = SonarrClient(
     api_key=os.getenv("SONARR_API_KEY"),
     timeout=10
 )
+# episode code, e.g. S02E03 -> ("02", "03")
+_CODE_RE = re.compile(r"S(\d{2})E(\d{2})")
+
 # ─── Main functions and routes ──────────────────────────────────
 def compute_stats():
     conn = get_conn()
@@ -98,8 +102,8 @@ def replace_episode():
         return jsonify({ "error": str(e) }), 500
 
     # ─── Optional: parse season number from code (e.g. S02E03) ────────────────
-    import re, subprocess
-    season_match = re.match(r"S(\d{2})E\d{2}", row["code"] or "")
+    import subprocess
+    season_match = _CODE_RE.match(row["code"] or "")
     season_num = int(season_match.group(1)) if season_match else None
 
     # ─── Trigger analyzer in the background for just this show/season ────────
@@ -114,6 +118,8 @@ def compute_mismatch_counts():
     """
     Returns a list of { seriesTitle: str, count: int }
     by counting episodes tagged specifically with 'problematic-episode'.
+    (episode_key, tag_id) is the episode_tags PK and tag names are unique,
+    so each episode joins at most once and a plain COUNT(*) is exact.
     """
     conn = get_conn()
     cur = conn.cursor()
@@ -121,7 +127,7 @@ def compute_mismatch_counts():
         """
         SELECT
           e.series_title   AS "seriesTitle",
-          COUNT(DISTINCT e.key) AS count
+          COUNT(*)         AS count
         FROM episodes e
         JOIN episode_tags et
           ON e.key = et.episode_key
@@ -339,8 +345,7 @@ def replace_episode_async():
             series_id = row["series_id"]
             episode_id = row["episode_id"]
 
-            import re
-            match = re.match(r"S(\d{2})E(\d{2})", row["code"] or "")
+            match = _CODE_RE.match(row["code"] or "")
             if not match:
                 raise ValueError(f"Invalid episode code: {row['code']}")
             season_number = int(match.group(1))
@@ -70,13 +70,31 @@ def normalize_title(text: str) -> str:
     text = unicodedata.normalize("NFKD", text)
     return "".join(c for c in text if c.isalnum()).lower()
 
-# End‐of‐title markers (lowercase) used for extraction logic (if needed)
-END_MARKERS = {
-    "1080p", "720p", "2160p", "480p",
+# End‐of‐title markers (lowercase) used for extraction logic (if needed).
+# Any NNNp/NNNNp resolution also ends a title; _TITLE_RE matches those.
+END_MARKERS = frozenset({
     "remux","bluray","web-dl","webrip","hdrip","hdtv",
     "dts","ddp51","ac3","vc1","x264","h264","hevc",
     "amzn","nf","max","dsnp","btn","kenobi","asmofuscated"
-}
+})
+
+# Precompiled patterns for extract_scene_title
+_SEASON_EP_RE    = re.compile(r"(?i)\bSeason[.\s_-]*\d+[.\s_-]*Ep[.\s_-]*(\d+)\b")
+_TOKEN_SPLIT_RE  = re.compile(r"[.\-_\s]+")
+_SEPARATORS_RE   = re.compile(r"[.\-_]+")
+
+# SxxEyy token, then everything up to the first end-marker/resolution token.
+# Markers containing a separator can never be a whole token, so skip them.
+_SEP = r"[.\-_\s]"
+_MARKERS = "|".join(
+    re.escape(m) for m in sorted(END_MARKERS, key=len, reverse=True)
+    if not _TOKEN_SPLIT_RE.search(m)
+)
+_TITLE_RE = re.compile(
+    rf"(?i)(?:^|{_SEP})S\d{{2}}E\d{{2}}(?={_SEP}|$)"
+    rf"(.*?)"
+    rf"(?:{_SEP}+(?:{_MARKERS}|\d{{3,4}}p)(?={_SEP}|$)|$)"
+)
 
 def extract_scene_title(scene_name: str) -> str:
     """
@@ -84,36 +102,19 @@ def extract_scene_title(scene_name: str) -> str:
     find SxxEyy, and collect title‐tokens (TitleCase or digits) until an end‐marker.
     """
     # 1) Collapse "Season <digits> Ep <digits>" → "Episode <digits>"
-    scene_name = re.sub(
-        r"(?i)\bSeason[.\s_-]*\d+[.\s_-]*Ep[.\s_-]*(\d+)\b",
-        r"Episode \1",
-        scene_name
-    )
-
-    # 2) Split on ., -, _, or whitespace
-    tokens = re.split(r"[.\-_\s]+", scene_name)
-
-    # 3) Find the SxxEyy token
-    for i, tok in enumerate(tokens):
-        if re.match(r"(?i)^S\d{2}E\d{2}$", tok):
-            title_parts = []
-            # 4) Collect tokens after SxxEyy until a marker
-            for w in tokens[i+1:]:
-                low = w.lower()
-                # Stop on resolution or any end‐marker
-                if low in END_MARKERS or re.match(r"^\d{3,4}p$", low):
-                    break
-
-                # Accept TitleCase (e.g. "Episode") or pure digits (e.g. "13")
-                if (len(w) > 1 and w[0].isupper() and w[1:].islower()) or w.isdigit():
-                    title_parts.append(w)
-                    continue
-
-            # 5) Join with spaces and return
-            return " ".join(title_parts)
+    scene_name = _SEASON_EP_RE.sub(r"Episode \1", scene_name)
+
+    # 2) One search finds SxxEyy and the span up to the first end-marker
+    m = _TITLE_RE.search(scene_name)
+    if m:
+        # 3) Keep TitleCase (e.g. "Episode") or pure digit (e.g. "13") tokens
+        return " ".join(
+            w for w in _TOKEN_SPLIT_RE.split(m.group(1))
+            if (len(w) > 1 and w[0].isupper() and w[1:].islower()) or w.isdigit()
+        )
 
     # Fallback: return entire name with separators replaced by spaces
-    return re.sub(r"[.\-_]+", " ", scene_name)
+    return _SEPARATORS_RE.sub(" ", scene_name)
 
 # ─── Cleanup Logic (uses SonarrClient from analyzer) ─────────────────────────
 @with_conn
@@ -38,6 +38,10 @@ SONARR_API_KEY = os.getenv("SONARR_API_KEY")
 # --- Logging helper for this module ---
 logger = logging.getLogger("jobs")
 
+# Shared keep-alive session for Sonarr command polling
+sonarr_session = requests.Session()
+sonarr_session.headers.update({"X-Api-Key": SONARR_API_KEY or ""})
+
 # --- Low-level helpers (thread-safe using jobs_lock) ------------------------
 def _with_lock(fn):
     def wrapped(*args, **kwargs):
@@ -92,9 +96,8 @@ def poll_sonarr_command(command_id, job_id=None, max_wait=120):
     start = time.time()
     while time.time() - start < max_wait:
         try:
-            r = requests.get(
+            r = sonarr_session.get(
                 f"{SONARR_URL}/api/v3/command/{command_id}",
-                headers={"X-Api-Key": SONARR_API_KEY},
                 timeout=10,
             )
             r.raise_for_status()